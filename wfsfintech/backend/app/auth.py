@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from jose import JWTError, jwt
 
@@ -26,12 +27,28 @@ def create_access_token(email: str) -> str:
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Verified token -> (email, exp timestamp). Bounded so junk tokens can't grow it.
+_TOKEN_CACHE: Dict[str, Tuple[str, float]] = {}
+_TOKEN_CACHE_MAX = 1024
+
+
 def decode_token(token: str) -> Optional[str]:
+    hit = _TOKEN_CACHE.get(token)
+    if hit is not None:
+        if hit[1] > time.time():
+            return hit[0]
+        _TOKEN_CACHE.pop(token, None)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
     except JWTError:
         return None
+    email = payload.get("sub")
+    exp = payload.get("exp")
+    if email and isinstance(exp, (int, float)):
+        if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+            _TOKEN_CACHE.clear()
+        _TOKEN_CACHE[token] = (email, float(exp))
+    return email
 
 
 def authenticate_advisor(email: str, password: str) -> Optional[dict]:
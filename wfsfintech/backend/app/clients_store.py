@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import re
 from pathlib import Path
 from typing import Dict, List
@@ -21,33 +22,56 @@ SEEDED_CLIENTS: List[ClientProfile] = [
     ClientProfile(client_id="liam", name="Liam O'Brien", risk_label="AGGRESSIVE", target_annual_vol=0.20),
 ]
 
+_SEEDED_IDS: frozenset = frozenset(c.client_id for c in SEEDED_CLIENTS)
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
 
 def _slug(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "-", s.lower()).strip("-") or "client"
+    return _SLUG_RE.sub("-", s.lower()).strip("-") or "client"
+
+
+# Parsed clients.json, keyed by the file's (mtime_ns, size) at read time.
+_CACHE: Dict[str, object] = {"stamp": None, "data": []}
 
 
 def _load_custom() -> List[dict]:
-    if not CLIENTS_FILE.exists():
+    """Return the onboarded clients; re-parses only when the file changes on disk.
+
+    The returned list is shared — copy it before mutating.
+    """
+    try:
+        st = os.stat(CLIENTS_FILE)
+    except OSError:
         return []
+    stamp = (st.st_mtime_ns, st.st_size)
+    if stamp == _CACHE["stamp"]:
+        return _CACHE["data"]  # type: ignore[return-value]
     try:
         with open(CLIENTS_FILE) as f:
-            return json.load(f)
+            data = json.load(f)
     except (json.JSONDecodeError, IOError):
         return []
+    _CACHE["stamp"] = stamp
+    _CACHE["data"] = data
+    return data
 
 
 def _save_custom(clients: List[dict]) -> None:
     with open(CLIENTS_FILE, "w") as f:
         json.dump(clients, f, indent=2)
+    st = os.stat(CLIENTS_FILE)
+    _CACHE["stamp"] = (st.st_mtime_ns, st.st_size)
+    _CACHE["data"] = clients
 
 
 def get_all_clients() -> List[ClientProfile]:
     custom = _load_custom()
-    seeded_ids = {c.client_id for c in SEEDED_CLIENTS}
     result = list(SEEDED_CLIENTS)
     for raw in custom:
         cid = raw.get("client_id")
-        if cid and cid not in seeded_ids:
+        if cid and cid not in _SEEDED_IDS:
             result.append(
                 ClientProfile(
                     client_id=cid,
@@ -61,8 +85,8 @@ def get_all_clients() -> List[ClientProfile]:
 
 def add_client(name: str, risk_label: str, target_annual_vol: float) -> ClientProfile:
     base_id = _slug(name)
-    custom = _load_custom()
-    existing_ids = {c["client_id"] for c in custom} | {c.client_id for c in SEEDED_CLIENTS}
+    custom = list(_load_custom())
+    existing_ids = _SEEDED_IDS.union(c["client_id"] for c in custom)
     client_id = base_id
     n = 1
     while client_id in existing_ids:
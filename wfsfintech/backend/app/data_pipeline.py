@@ -8,12 +8,15 @@ Step 4: Annualise volatility with √252
 Step 5: Feature matrix construction (for vol forecaster — placeholder)
 Step 6: Scaling for regime classifier (standardise: mean 0, std 1)
 Step 7: Temporal integrity — train/val/test splits, no leakage
-Step 8: Cache to parquet, load from disk
+Step 8: Cache to feather (Arrow IPC), load from disk
 """
 
 from __future__ import annotations
 
 import hashlib
+import logging
+import math
+from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
@@ -23,7 +26,13 @@ import yfinance as yf
 from .config import CACHE_DIR
 
 
+logger = logging.getLogger(__name__)
+
 TRADING_DAYS_PER_YEAR = 252
+SQRT_TRADING_DAYS = math.sqrt(TRADING_DAYS_PER_YEAR)
+
+BENCHMARK_SYMBOL = "^GSPC"  # S&P 500
+RISK_FREE_SYMBOL = "^TNX"  # 10-year Treasury yield, in percent
 
 
 # --- Step 1: Missing Values ---
@@ -75,9 +84,13 @@ def align_prices_to_common_dates(prices_df: pd.DataFrame) -> pd.DataFrame:
     Step 2 (single DataFrame): Keep only dates where ALL tickers have valid data.
     Strict inner join.
     """
-    data = prices_df.dropna(how="any")
-    data = data.sort_index()
-    data = data[~data.index.duplicated(keep="first")]
+    # One row selection instead of dropna -> sort_index -> dedupe copies.
+    complete = ~np.isnan(prices_df.to_numpy(dtype=np.float64)).any(axis=1)
+    rows = np.flatnonzero(complete)
+    rows = rows[~prices_df.index[rows].duplicated(keep="first")]
+    data = prices_df.iloc[rows]
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
     return data
 
 
@@ -91,7 +104,15 @@ def compute_log_returns(prices: pd.DataFrame) -> pd.DataFrame:
     - Approximately normal for short horizons
     - Additive across time (10-day log return = sum of 10 daily log returns)
     """
-    return np.log(prices / prices.shift(1)).dropna()
+    arr = np.asarray(prices.to_numpy(), dtype=np.float64)
+    log_ret = np.log(arr[1:])
+    log_ret -= np.log(arr[:-1])
+    index = prices.index[1:]
+    # Preserve dropna semantics for frames that still carry gaps.
+    valid = ~np.isnan(log_ret).any(axis=1)
+    if not valid.all():
+        log_ret, index = log_ret[valid], index[valid]
+    return pd.DataFrame(log_ret, index=index, columns=prices.columns)
 
 
 # --- Step 4: Annualising Volatility ---
@@ -102,7 +123,7 @@ def annualise_volatility(daily_vol: pd.Series | pd.DataFrame) -> pd.Series | pd.
     Step 4: Multiply daily volatility by √252.
     Makes HV comparable to IV (always quoted annualised).
     """
-    return daily_vol * np.sqrt(TRADING_DAYS_PER_YEAR)
+    return daily_vol * SQRT_TRADING_DAYS
 
 
 def annualise_return(daily_return: pd.Series | pd.DataFrame) -> pd.Series | pd.DataFrame:
@@ -133,7 +154,7 @@ def build_feature_matrix(
 
     # Placeholder — extend when building vol forecaster
     log_ret = compute_log_returns(prices) if returns is None else returns
-    realised_vol = log_ret.rolling(target_window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+    realised_vol = log_ret.rolling(target_window).std() * SQRT_TRADING_DAYS
     return log_ret, realised_vol
 
 
@@ -150,11 +171,22 @@ def standardise_features(
     Compute mean/std on TRAINING data only. Apply same transform to val/test.
     Never compute scaling stats on test set (data leakage).
     """
+    arr = X.to_numpy(dtype=np.float64)
+    # nan-aware, ddof=1 reductions match pandas' mean()/std() defaults.
     if train_mean is None:
-        train_mean = X.mean()
+        mu = np.nanmean(arr, axis=0)
+        train_mean = pd.Series(mu, index=X.columns)
+    else:
+        mu = train_mean.reindex(X.columns).to_numpy(dtype=np.float64)
     if train_std is None:
-        train_std = X.std().replace(0, np.nan)
-    X_scaled = (X - train_mean) / train_std
+        sd = np.nanstd(arr, axis=0, ddof=1)
+        sd[sd == 0] = np.nan
+        train_std = pd.Series(sd, index=X.columns)
+    else:
+        sd = train_std.reindex(X.columns).to_numpy(dtype=np.float64)
+    out = arr - mu
+    out /= sd
+    X_scaled = pd.DataFrame(out, index=X.index, columns=X.columns)
     return X_scaled, train_mean, train_std
 
 
@@ -179,14 +211,43 @@ def temporal_split(
 # --- Step 8: Caching ---
 
 
-def _cache_path(key: str, suffix: str) -> str:
-    path = CACHE_DIR / f"{key}_{suffix}.parquet"
-    return str(path)
+def _cache_path(key: str, suffix: str) -> Path:
+    return CACHE_DIR / f"{key}_{suffix}.feather"
 
 
 def _cache_key(tickers: List[str], start: str, end: str) -> str:
     s = "_".join(sorted(tickers)) + f"_{start}_{end}".replace("-", "")
-    return hashlib.md5(s.encode()).hexdigest()[:16]
+    return hashlib.blake2b(s.encode(), digest_size=8).hexdigest()
+
+
+# Frames already decoded from disk, keyed by path and the file's (mtime_ns, size).
+_FRAME_CACHE: Dict[Path, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """Single stat: None if the file is missing, else (mtime_ns, size)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _write_frame(df: pd.DataFrame, path: Path) -> None:
+    # Feather needs a default index, so the date index travels as the first column.
+    df.reset_index().to_feather(path, compression="zstd", compression_level=1)
+
+
+def _read_frame(path: Path, stamp: Tuple[int, int]) -> pd.DataFrame:
+    hit = _FRAME_CACHE.get(path)
+    if hit is None or hit[0] != stamp:
+        df = pd.read_feather(path)
+        df = df.set_index(df.columns[0])
+        if df.index.name == "index":
+            df.index.name = None
+        _FRAME_CACHE[path] = hit = (stamp, df)
+    # Shallow copy so callers can't rename/reassign columns on the memoised frame.
+    return hit[1].copy(deep=False)
 
 
 def load_from_cache(
@@ -198,9 +259,11 @@ def load_from_cache(
     key = _cache_key(tickers, start, end)
     prices_path = _cache_path(key, "prices")
     returns_path = _cache_path(key, "returns")
-    if os.path.exists(prices_path) and os.path.exists(returns_path):
-        return pd.read_parquet(prices_path), pd.read_parquet(returns_path)
-    return None
+    prices_stamp = _file_stamp(prices_path)
+    returns_stamp = _file_stamp(returns_path)
+    if prices_stamp is None or returns_stamp is None:
+        return None
+    return _read_frame(prices_path, prices_stamp), _read_frame(returns_path, returns_stamp)
 
 
 def save_to_cache(
@@ -212,8 +275,8 @@ def save_to_cache(
 ) -> None:
     """Step 8: Save preprocessed data to disk."""
     key = _cache_key(tickers, start, end)
-    prices.to_parquet(_cache_path(key, "prices"))
-    returns.to_parquet(_cache_path(key, "returns"))
+    _write_frame(prices, _cache_path(key, "prices"))
+    _write_frame(returns, _cache_path(key, "returns"))
 
 
 # --- Full Pipeline ---
@@ -227,20 +290,25 @@ def fetch_price_data(
     """Fetch raw Close prices from Yahoo Finance."""
     if isinstance(tickers, str):
         tickers = [tickers]
-    raw = yf.download(tickers, start=start, end=end, progress=False, auto_adjust=True)
+    raw = yf.download(
+        tickers,
+        start=start,
+        end=end,
+        progress=False,
+        auto_adjust=True,
+        group_by="ticker",
+        threads=True,
+    )
 
     if isinstance(raw.columns, pd.MultiIndex):
-        if "Close" in raw.columns.get_level_values(0):
-            raw = raw["Close"].copy()
-        if isinstance(raw, pd.Series):
-            raw = raw.to_frame()
-        raw.columns = tickers
+        # group_by="ticker" yields (ticker, field) columns; slice Close per ticker.
+        raw = raw.xs("Close", axis=1, level=1).reindex(columns=tickers)
     else:
         if "Close" in raw.columns:
-            raw = raw[["Close"]].copy()
+            raw = raw[["Close"]]
         raw.columns = tickers
 
-    print(f"Raw data shape: {raw.shape}")
+    logger.debug("Raw data shape: %s", raw.shape)
     return raw
 
 
@@ -248,7 +316,7 @@ def clean_price_data(raw_data: pd.DataFrame) -> pd.DataFrame:
     """Steps 1 & 2: Forward-fill + align timestamps (inner join)."""
     data = forward_fill_prices(raw_data)
     data = align_prices_to_common_dates(data)
-    print(f"Cleaned data shape: {data.shape}")
+    logger.debug("Cleaned data shape: %s", data.shape)
     return data
 
 
@@ -265,7 +333,10 @@ def validate_data(data: pd.DataFrame, min_rows: int = 500) -> bool:
         ("PASS: No missing values", checks[2]),
         ("PASS: All prices positive", checks[3]),
     ]:
-        print(msg if ok else msg.replace("PASS", "FAIL"))
+        if ok:
+            logger.debug(msg)
+        else:
+            logger.warning(msg.replace("PASS", "FAIL"))
     return all(checks)
 
 
@@ -286,7 +357,7 @@ def get_clean_data(
     if use_cache:
         cached = load_from_cache(tickers, start, end)
         if cached is not None:
-            print(f"Loaded from cache: {CACHE_DIR}")
+            logger.debug("Loaded from cache: %s", CACHE_DIR)
             return cached
 
     raw = fetch_price_data(tickers, start, end)
@@ -298,7 +369,7 @@ def get_clean_data(
 
     if use_cache:
         save_to_cache(cleaned, returns, tickers, start, end)
-        print(f"Cached to {CACHE_DIR}")
+        logger.debug("Cached to %s", CACHE_DIR)
 
     return cleaned, returns
 
@@ -308,7 +379,7 @@ def fetch_benchmark(
     end: str = "2024-01-01",
 ) -> pd.Series:
     """Pull S&P 500 benchmark."""
-    raw = yf.download("^GSPC", start=start, end=end, progress=False)
+    raw = yf.download(BENCHMARK_SYMBOL, start=start, end=end, progress=False)
     if "Close" in raw.columns:
         col = raw["Close"]
     elif "Adj Close" in raw.columns:
@@ -320,7 +391,7 @@ def fetch_benchmark(
 
 def fetch_risk_free_rate() -> float:
     """Pull 10-year Treasury yield (annualised, decimal)."""
-    tnx = yf.download("^TNX", progress=False)
+    tnx = yf.download(RISK_FREE_SYMBOL, progress=False)
     if "Close" in tnx.columns:
         col = tnx["Close"]
     elif "Adj Close" in tnx.columns:
@@ -329,3 +400,25 @@ def fetch_risk_free_rate() -> float:
         col = tnx.iloc[:, 0]
     return float(col.iloc[-1] / 100)
 
+
+def fetch_market_bundle(
+    tickers: List[str] | str,
+    start: str = "2021-01-01",
+    end: str = "2024-01-01",
+) -> Tuple[pd.DataFrame, pd.Series, float]:
+    """
+    Fetch raw asset Close prices, the S&P 500 benchmark and the 10-year yield
+    in a single batched download instead of three separate round trips.
+    The risk-free rate is the last yield on or before `end` (annualised, decimal).
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys([*tickers, BENCHMARK_SYMBOL, RISK_FREE_SYMBOL]))
+    closes = fetch_price_data(symbols, start, end)
+    prices = closes[list(tickers)]
+    benchmark = closes[BENCHMARK_SYMBOL].ffill().dropna()
+    yields = closes[RISK_FREE_SYMBOL].dropna()
+    if benchmark.empty or yields.empty:
+        raise ValueError(f"No {BENCHMARK_SYMBOL}/{RISK_FREE_SYMBOL} data between {start} and {end}.")
+    risk_free = float(yields.iloc[-1] / 100)
+    return prices, benchmark, risk_free
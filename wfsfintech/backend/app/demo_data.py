@@ -8,8 +8,9 @@ without live market data or trained models.
 
 from __future__ import annotations
 
-import math
+from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 import numpy as np
@@ -17,6 +18,7 @@ import numpy as np
 from .iv_fetcher import IVFetchError, get_stock_iv_cached
 from .domain import (
     ClientProfile,
+    FearLevel,
     NarrativeExplanation,
     PortfolioComparison,
     PortfolioWeights,
@@ -28,27 +30,59 @@ from .domain import (
 
 RNG = np.random.default_rng(seed=42)
 
+_BASE_IV_BY_REGIME: Dict[RegimeName, float] = {
+    "LOW_VOL": 0.15,
+    "NORMAL": 0.20,
+    "STRESS": 0.30,
+    "CRISIS": 0.45,
+}
+_IVR_THRESHOLDS: Dict[RegimeName, float] = {
+    "LOW_VOL": 1.2,
+    "NORMAL": 1.5,
+    "STRESS": 1.8,
+    "CRISIS": 2.0,
+}
+
+_FEAR_LEVELS: Tuple[FearLevel, ...] = ("NONE", "ELEVATED_FEAR", "HIGH_FEAR")
+_FEAR_ACTIONS: Tuple[str, ...] = (
+    "Hold position",
+    "Trim position moderately",
+    "Reduce position significantly",
+)
+
+# Fraction of the baseline weight removed for each fear level.
+_FEAR_TRIM: Dict[str, float] = {"NONE": 0.0, "ELEVATED_FEAR": 0.2, "HIGH_FEAR": 0.4}
+
+
+# Shared by every PortfolioWeights / PortfolioComparison weight vector.
+UNIVERSE: Tuple[str, ...] = (
+    "AAPL",
+    "MSFT",
+    "NVDA",
+    "GOOGL",
+    "AMZN",
+    "META",
+    "SPY",
+    "HYG",
+    "TLT",
+    "XLE",
+    "XLV",
+    "XLF",
+)
+
 
 def get_universe() -> List[str]:
-    return [
-        "AAPL",
-        "MSFT",
-        "NVDA",
-        "GOOGL",
-        "AMZN",
-        "META",
-        "SPY",
-        "HYG",
-        "TLT",
-        "XLE",
-        "XLV",
-        "XLF",
-    ]
+    return list(UNIVERSE)
 
 
 def get_demo_regime() -> RegimeName:
+    return _regime_for_ordinal(date.today().toordinal())
+
+
+@lru_cache(maxsize=4)
+def _regime_for_ordinal(ordinal: int) -> RegimeName:
     # Simple cyclic regime based on day of month
-    day = date.today().day
+    day = date.fromordinal(ordinal).day
     if day % 4 == 0:
         return "CRISIS"
     if day % 3 == 0:
@@ -58,58 +92,52 @@ def get_demo_regime() -> RegimeName:
     return "LOW_VOL"
 
 
+def _signal_kernel(
+    ivs: np.ndarray, base_iv: float, threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorised IV / predicted HV / IVR / IV percentile / fear code for the whole universe."""
+    idx = np.arange(ivs.size)
+    noise = 0.02 * np.sin(idx) + 0.01 * (idx % 3)
+    ivs = np.where(np.isnan(ivs), np.maximum(0.05, base_iv + noise), ivs)
+    predicted_hv = np.maximum(0.05, ivs / (1.1 + 0.1 * np.cos(idx)))
+    ivr = ivs / predicted_hv
+    iv_percentile = np.clip(0.7 + 0.03 * (idx % 5), 0.0, 1.0)
+    # 0 = NONE, 1 = ELEVATED_FEAR, 2 = HIGH_FEAR; indexes _FEAR_LEVELS / _FEAR_ACTIONS.
+    fearful = (ivr > threshold) & (iv_percentile >= 0.8)
+    fear_codes = fearful * (1 + (ivr > threshold + 0.3))
+    return ivs, predicted_hv, ivr, iv_percentile, fear_codes
+
+
 def generate_ticker_signals() -> List[TickerSignal]:
     regime = get_demo_regime()
     universe = get_universe()
     signals: List[TickerSignal] = []
 
-    base_iv_by_regime: Dict[RegimeName, float] = {
-        "LOW_VOL": 0.15,
-        "NORMAL": 0.20,
-        "STRESS": 0.30,
-        "CRISIS": 0.45,
-    }
-    ivr_thresholds: Dict[RegimeName, float] = {
-        "LOW_VOL": 1.2,
-        "NORMAL": 1.5,
-        "STRESS": 1.8,
-        "CRISIS": 2.0,
-    }
-
-    base_iv = base_iv_by_regime[regime]
-    threshold = ivr_thresholds[regime]
+    base_iv = _BASE_IV_BY_REGIME[regime]
+    threshold = _IVR_THRESHOLDS[regime]
 
+    # Try cache-first options IV; NaN marks tickers that fall back to synthetic.
+    ivs = np.full(len(universe), np.nan)
     for i, symbol in enumerate(universe):
-        noise = 0.02 * math.sin(i) + 0.01 * (i % 3)
-        # Try cache-first options IV; fall back to synthetic if unavailable.
         try:
-            iv = float(get_stock_iv_cached(symbol, refresh=False))
+            ivs[i] = float(get_stock_iv_cached(symbol, refresh=False))
         except (IVFetchError, Exception):
-            iv = max(0.05, base_iv + noise)
-        predicted_hv = max(0.05, iv / (1.1 + 0.1 * math.cos(i)))
-        ivr = iv / predicted_hv
-        iv_percentile = min(1.0, max(0.0, 0.7 + 0.03 * (i % 5)))
-
-        fear_level = "NONE"
-        recommended_action = "Hold position"
-        if ivr > threshold and iv_percentile >= 0.8:
-            if ivr > threshold + 0.3:
-                fear_level = "HIGH_FEAR"
-                recommended_action = "Reduce position significantly"
-            else:
-                fear_level = "ELEVATED_FEAR"
-                recommended_action = "Trim position moderately"
+            pass
+
+    ivs, predicted_hv, ivr, iv_percentile, fear_codes = _signal_kernel(ivs, base_iv, threshold)
 
+    for i, symbol in enumerate(universe):
+        code = int(fear_codes[i])
         signals.append(
             TickerSignal(
                 symbol=symbol,
-                iv=iv,
-                predicted_hv=predicted_hv,
-                ivr=ivr,
-                iv_percentile=iv_percentile,
+                iv=float(ivs[i]),
+                predicted_hv=float(predicted_hv[i]),
+                ivr=float(ivr[i]),
+                iv_percentile=float(iv_percentile[i]),
                 regime=regime,
-                fear_level=fear_level,
-                recommended_action=recommended_action,
+                fear_level=_FEAR_LEVELS[code],
+                recommended_action=_FEAR_ACTIONS[code],
             )
         )
 
@@ -121,10 +149,15 @@ def get_demo_clients() -> List[ClientProfile]:
     return get_all_clients()
 
 
-def _demo_current_weights(universe: List[str]) -> Dict[str, float]:
+def _demo_current_weights(universe: Tuple[str, ...]) -> np.ndarray:
     raw = RNG.random(len(universe))
-    raw = raw / raw.sum()
-    return {s: float(w) for s, w in zip(universe, raw)}
+    return (raw / raw.sum()).astype(np.float32)
+
+
+def _normalise(weights: np.ndarray) -> np.ndarray:
+    total = weights.sum() or 1.0
+    weights /= total
+    return weights
 
 
 def _scale_vol_to_target(base_vol: float, target_vol: float) -> float:
@@ -132,7 +165,7 @@ def _scale_vol_to_target(base_vol: float, target_vol: float) -> float:
 
 
 def _make_portfolio(
-    as_of: str, weights: Dict[str, float], target_vol: float, risk_multiplier: float
+    as_of: str, weights: np.ndarray, target_vol: float, risk_multiplier: float
 ) -> PortfolioWeights:
     # Simple demo: expected_vol scales with risk_multiplier and target_vol
     expected_vol = _scale_vol_to_target(target_vol * risk_multiplier, target_vol)
@@ -140,6 +173,7 @@ def _make_portfolio(
     sharpe = expected_return / expected_vol if expected_vol > 0 else 0.0
     return PortfolioWeights(
         as_of=as_of,
+        symbols=UNIVERSE,
         weights=weights,
         expected_return=expected_return,
         expected_vol=expected_vol,
@@ -148,12 +182,21 @@ def _make_portfolio(
 
 
 def generate_portfolio_comparisons() -> List[PortfolioComparison]:
-    today = date.today().isoformat()
-    universe = get_universe()
+    return _comparisons_from_signals(generate_ticker_signals(), date.today().isoformat())
+
+
+def _comparisons_from_signals(
+    signal_list: List[TickerSignal], today: str
+) -> List[PortfolioComparison]:
+    universe = UNIVERSE
     clients = get_demo_clients()
 
     base_current = _demo_current_weights(universe)
-    signals = {s.symbol: s for s in generate_ticker_signals()}
+    signals = {s.symbol: s for s in signal_list}
+    trim = np.array(
+        [_FEAR_TRIM[signals[s].fear_level] if s in signals else 0.0 for s in universe],
+        dtype=np.float32,
+    )
 
     results: List[PortfolioComparison] = []
 
@@ -162,43 +205,19 @@ def generate_portfolio_comparisons() -> List[PortfolioComparison]:
         tilt_factor = 1.0 + 0.1 * (
             1 if client.risk_label in ("AGGRESSIVE",) else -1
         )
-        current_weights = {
-            symbol: max(0.0, min(1.0, w * tilt_factor))
-            for symbol, w in base_current.items()
-        }
-        total = sum(current_weights.values()) or 1.0
-        current_weights = {k: v / total for k, v in current_weights.items()}
-
-        baseline_optimal_weights = {
-            s: float(max(0.0, w * RNG.normal(1.0, 0.05)))
-            for s, w in current_weights.items()
-        }
-        total_b = sum(baseline_optimal_weights.values()) or 1.0
-        baseline_optimal_weights = {k: v / total_b for k, v in baseline_optimal_weights.items()}
-
-        iv_adjusted_weights = {}
-        for s, w in baseline_optimal_weights.items():
-            signal = signals.get(s)
-            if signal and signal.fear_level != "NONE":
-                trim = 0.4 if signal.fear_level == "HIGH_FEAR" else 0.2
-                iv_adjusted_weights[s] = max(0.0, w * (1.0 - trim))
-            else:
-                iv_adjusted_weights[s] = w
-        total_iv = sum(iv_adjusted_weights.values()) or 1.0
-        iv_adjusted_weights = {k: v / total_iv for k, v in iv_adjusted_weights.items()}
+        current = _normalise(np.clip(base_current * tilt_factor, 0.0, 1.0))
+        baseline = _normalise(
+            np.maximum(0.0, current * RNG.normal(1.0, 0.05, len(universe)).astype(np.float32))
+        )
+        iv_adjusted = _normalise(np.maximum(0.0, baseline * (1.0 - trim)))
 
         baseline_port = _make_portfolio(
-            today, baseline_optimal_weights, client.target_annual_vol, risk_multiplier=1.0
+            today, baseline, client.target_annual_vol, risk_multiplier=1.0
         )
         iv_adjusted_port = _make_portfolio(
-            today, iv_adjusted_weights, client.target_annual_vol, risk_multiplier=0.9
+            today, iv_adjusted, client.target_annual_vol, risk_multiplier=0.9
         )
 
-        drift = {
-            s: float(iv_adjusted_weights.get(s, 0.0) - current_weights.get(s, 0.0))
-            for s in universe
-        }
-
         current_annual_vol = _scale_vol_to_target(
             client.target_annual_vol * (1.1 if client.risk_label == "AGGRESSIVE" else 0.95),
             client.target_annual_vol,
@@ -208,10 +227,11 @@ def generate_portfolio_comparisons() -> List[PortfolioComparison]:
         results.append(
             PortfolioComparison(
                 client=client,
-                current_weights=current_weights,
+                symbols=universe,
+                current_weights=current,
                 baseline_optimal=baseline_port,
                 iv_adjusted_optimal=iv_adjusted_port,
-                drift_from_optimal=drift,
+                drift_from_optimal=iv_adjusted - current,
                 current_annual_vol=current_annual_vol,
                 misaligned_with_profile=misaligned,
             )
@@ -220,68 +240,93 @@ def generate_portfolio_comparisons() -> List[PortfolioComparison]:
     return results
 
 
-def generate_stress_tests() -> List[StressTestResult]:
-    comparisons = generate_portfolio_comparisons()
-    avg_vol_current = float(
-        np.mean([c.current_annual_vol for c in comparisons])
-    )
-    avg_vol_iv = float(
-        np.mean([c.iv_adjusted_optimal.expected_vol for c in comparisons])
+# (name, description, base shock, IV-adjusted shock); losses scale with average vol.
+_STRESS_SCENARIOS: Tuple[Tuple[str, str, float, float], ...] = (
+    (
+        "2008_GFC",
+        "Global Financial Crisis-style equity meltdown with flight to quality in Treasuries.",
+        -0.45,
+        -0.32,
+    ),
+    (
+        "2020_COVID",
+        "COVID crash with sharp but brief volatility spike and rapid policy response.",
+        -0.35,
+        -0.24,
+    ),
+    (
+        "2022_RATE_SHOCK",
+        "Rate shock where both equities and bonds sell off together.",
+        -0.30,
+        -0.21,
+    ),
+    # VIX doubling scenario: assume IV-adjusted portfolio is more stable
+    (
+        "VIX_DOUBLING",
+        "Hypothetical scenario where implied volatility doubles overnight across the universe.",
+        -0.25,
+        -0.17,
+    ),
+)
+_STRESS_SHOCKS = np.array([sc[2:] for sc in _STRESS_SCENARIOS], dtype=np.float64)
+
+
+@dataclass
+class _World:
+    """Everything one request derives from the current regime and signals."""
+
+    regime: RegimeName
+    signals: List[TickerSignal]
+    comparisons: List[PortfolioComparison]
+    current_vols: np.ndarray  # per comparison, current_annual_vol
+    iv_vols: np.ndarray  # per comparison, iv_adjusted_optimal.expected_vol
+
+
+def _build_world() -> _World:
+    """Compute signals and portfolio comparisons once for the calling request."""
+    signals = generate_ticker_signals()
+    comparisons = _comparisons_from_signals(signals, date.today().isoformat())
+    n = len(comparisons)
+    current_vols = np.empty(n, dtype=np.float64)
+    iv_vols = np.empty(n, dtype=np.float64)
+    for i, c in enumerate(comparisons):
+        current_vols[i] = c.current_annual_vol
+        iv_vols[i] = c.iv_adjusted_optimal.expected_vol
+    return _World(
+        regime=signals[0].regime if signals else get_demo_regime(),
+        signals=signals,
+        comparisons=comparisons,
+        current_vols=current_vols,
+        iv_vols=iv_vols,
     )
 
-    scenarios: List[Tuple[str, str, float, float]] = [
-        (
-            "2008_GFC",
-            "Global Financial Crisis-style equity meltdown with flight to quality in Treasuries.",
-            -0.45,
-            -0.32,
-        ),
-        (
-            "2020_COVID",
-            "COVID crash with sharp but brief volatility spike and rapid policy response.",
-            -0.35,
-            -0.24,
-        ),
-        (
-            "2022_RATE_SHOCK",
-            "Rate shock where both equities and bonds sell off together.",
-            -0.30,
-            -0.21,
-        ),
-    ]
 
-    results: List[StressTestResult] = []
-    for name, desc, base_shock, iv_shock in scenarios:
-        loss_current = base_shock * (avg_vol_current / 0.20)
-        loss_iv_adj = iv_shock * (avg_vol_iv / 0.18)
-        results.append(
-            StressTestResult(
-                name=name,
-                description=desc,
-                portfolio_loss_pct_current=loss_current,
-                portfolio_loss_pct_iv_adjusted=loss_iv_adj,
-            )
-        )
+def generate_stress_tests() -> List[StressTestResult]:
+    world = _build_world()
+    avg_vol_current = float(world.current_vols.mean())
+    avg_vol_iv = float(world.iv_vols.mean())
 
-    # VIX doubling scenario: assume IV-adjusted portfolio is more stable
-    vix_double_loss_current = -0.25 * (avg_vol_current / 0.20)
-    vix_double_loss_iv = -0.17 * (avg_vol_iv / 0.18)
-    results.append(
+    losses_current = _STRESS_SHOCKS[:, 0] * (avg_vol_current / 0.20)
+    losses_iv_adj = _STRESS_SHOCKS[:, 1] * (avg_vol_iv / 0.18)
+
+    return [
         StressTestResult(
-            name="VIX_DOUBLING",
-            description="Hypothetical scenario where implied volatility doubles overnight across the universe.",
-            portfolio_loss_pct_current=vix_double_loss_current,
-            portfolio_loss_pct_iv_adjusted=vix_double_loss_iv,
+            name=name,
+            description=desc,
+            portfolio_loss_pct_current=float(loss_current),
+            portfolio_loss_pct_iv_adjusted=float(loss_iv_adj),
         )
-    )
-
-    return results
+        for (name, desc, _, _), loss_current, loss_iv_adj in zip(
+            _STRESS_SCENARIOS, losses_current, losses_iv_adj
+        )
+    ]
 
 
 def generate_narrative_for_client(client_id: str) -> NarrativeExplanation:
-    regime = get_demo_regime()
-    signals = generate_ticker_signals()
-    portfolios = {c.client.client_id: c for c in generate_portfolio_comparisons()}
+    world = _build_world()
+    regime = world.regime
+    signals = world.signals
+    portfolios = {c.client.client_id: c for c in world.comparisons}
     portfolio = portfolios.get(client_id)
 
     top_fear = [s for s in signals if s.fear_level != "NONE"]
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
 
 
 RegimeName = Literal["LOW_VOL", "NORMAL", "STRESS", "CRISIS"]
 FearLevel = Literal["NONE", "ELEVATED_FEAR", "HIGH_FEAR"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TickerSignal:
     symbol: str
     iv: float
@@ -20,7 +22,7 @@ class TickerSignal:
     recommended_action: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClientProfile:
     client_id: str
     name: str
@@ -28,27 +30,52 @@ class ClientProfile:
     target_annual_vol: float
 
 
-@dataclass
+# eq=False: ndarray fields have no truth-valued equality or hash.
+@dataclass(slots=True, frozen=True, eq=False)
 class PortfolioWeights:
     as_of: str
-    weights: Dict[str, float]
+    symbols: Tuple[str, ...]
+    weights: np.ndarray  # aligned with symbols
     expected_return: float
     expected_vol: float
     sharpe: float
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "weights", np.ascontiguousarray(self.weights, dtype=np.float32))
+
+    @property
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, self.weights.tolist()))
+
 
-@dataclass
+# eq=False: ndarray fields have no truth-valued equality or hash.
+@dataclass(slots=True, frozen=True, eq=False)
 class PortfolioComparison:
     client: ClientProfile
-    current_weights: Dict[str, float]
+    symbols: Tuple[str, ...]
+    current_weights: np.ndarray  # aligned with symbols
     baseline_optimal: PortfolioWeights
     iv_adjusted_optimal: PortfolioWeights
-    drift_from_optimal: Dict[str, float]
+    drift_from_optimal: np.ndarray  # aligned with symbols
     current_annual_vol: float
     misaligned_with_profile: bool
 
+    def __post_init__(self) -> None:
+        for name in ("current_weights", "drift_from_optimal"):
+            object.__setattr__(
+                self, name, np.ascontiguousarray(getattr(self, name), dtype=np.float32)
+            )
+
+    @property
+    def current_weights_as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, self.current_weights.tolist()))
+
+    @property
+    def drift_as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, self.drift_from_optimal.tolist()))
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StressTestResult:
     name: str
     description: str
@@ -56,7 +83,7 @@ class StressTestResult:
     portfolio_loss_pct_iv_adjusted: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NarrativeExplanation:
     client_id: str
     title: str
@@ -1,7 +1,7 @@
 """
 SignalEngine — Compute implied volatility from options for individual stocks.
 
-Cache-first: we write IV snapshots to disk so demos don't depend on live API calls.
+Cache-first: we write IV snapshots to a local SQLite store so demos don't depend on live API calls.
 """
 
 from __future__ import annotations
@@ -9,15 +9,20 @@ from __future__ import annotations
 import json
 import math
 import re
+import sqlite3
+import statistics
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, Tuple
 
-import pandas as pd
+import numpy as np
 import yfinance as yf
-from py_vollib.black_scholes.implied_volatility import implied_volatility
+from numba import njit
 
 from .config import CACHE_DIR
 
@@ -26,11 +31,16 @@ class IVFetchError(ValueError):
     pass
 
 
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@lru_cache(maxsize=512)
 def _safe_symbol(symbol: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_.-]+", "_", symbol)
+    return _SAFE_RE.sub("_", symbol)
 
 
 def _cache_path(symbol: str) -> Path:
+    # Legacy per-symbol snapshot file; imported into the SQLite store when it is opened.
     return CACHE_DIR / f"iv_snapshot_{_safe_symbol(symbol)}.json"
 
 
@@ -44,40 +54,208 @@ def _read_json(path: Path) -> Optional[dict]:
         return None
 
 
-def _write_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(".tmp")
-    with open(tmp, "w") as f:
-        json.dump(data, f, indent=2)
-    tmp.replace(path)
+# All IV snapshots live in one SQLite table; payload holds the full snapshot JSON.
+_DB_PATH = CACHE_DIR / "iv.db"
+_db: Optional[sqlite3.Connection] = None
+_db_lock = threading.Lock()
 
 
-def get_stock_iv(ticker_symbol: str = "AAPL") -> float:
-    """
-    Get implied volatility for a stock/ETF from its ATM call option.
-    Works for individual stocks/ETFs (AAPL, MSFT, NVDA, SPY, etc.).
-
-    Notes:
-    - Indices like SPX / ^GSPC often won't have an options chain here.
-    - Prefers Yahoo's impliedVolatility field when present.
-    - Falls back to computing IV using py_vollib if needed.
-    """
-    if ticker_symbol.startswith("^"):
-        raise IVFetchError(
-            f"No options data for {ticker_symbol}. Indices (e.g. ^GSPC) are not supported."
+def _get_db() -> sqlite3.Connection:
+    """Shared connection; callers must hold _db_lock."""
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(str(_DB_PATH), check_same_thread=False)
+        _db.execute("PRAGMA journal_mode=WAL")
+        # A re-fetchable demo cache: WAL commits skip fsync; only checkpoints sync.
+        _db.execute("PRAGMA synchronous=NORMAL")
+        _db.execute(
+            "CREATE TABLE IF NOT EXISTS iv ("
+            "symbol TEXT PRIMARY KEY, iv REAL, fetched_at INTEGER, payload TEXT)"
+        )
+        _import_legacy_snapshots(_db)
+    return _db
+
+
+def _import_legacy_snapshots(db: sqlite3.Connection) -> None:
+    """One pass over old iv_snapshot_*.json files; existing store rows win."""
+    for path in CACHE_DIR.glob("iv_snapshot_*.json"):
+        legacy = _read_json(path)
+        if not legacy or not isinstance(legacy.get("iv"), (int, float)):
+            continue
+        symbol = legacy.get("symbol")
+        if not isinstance(symbol, str) or _cache_path(symbol) != path:
+            continue
+        data = {**legacy, "fetched_at": int(legacy.get("fetched_at", 0) or 0)}
+        db.execute(
+            "INSERT INTO iv (symbol, iv, fetched_at, payload) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(symbol) DO NOTHING",
+            (symbol, data["iv"], data["fetched_at"], _encode_snapshot(data)),
         )
+    db.commit()
 
-    t = yf.Ticker(ticker_symbol)
 
-    # Get spot price (S)
-    S = t.info.get("currentPrice")
-    if not S or not isinstance(S, (int, float)) or S <= 0:
+def _encode_snapshot(data: dict) -> str:
+    # Machine-read only: compact separators, no pretty-printing.
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _upsert_snapshot(db: sqlite3.Connection, data: dict, payload: str) -> None:
+    """Stage a snapshot write of an encoded payload; callers hold _db_lock and commit."""
+    db.execute(
+        "INSERT INTO iv (symbol, iv, fetched_at, payload) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(symbol) DO UPDATE SET "
+        "iv = excluded.iv, fetched_at = excluded.fetched_at, payload = excluded.payload",
+        (data["symbol"], data["iv"], data["fetched_at"], payload),
+    )
+
+
+def _write_snapshot(data: dict) -> None:
+    payload = _encode_snapshot(data)  # before taking the lock
+    with _db_lock:
+        db = _get_db()
+        _upsert_snapshot(db, data, payload)
+        db.commit()
+
+
+def _decode_snapshot(payload: Any) -> Optional[dict]:
+    try:
+        return json.loads(payload)
+    except (TypeError, json.JSONDecodeError):
+        return None
+
+
+def read_iv_snapshots(symbols: Sequence[str]) -> Dict[str, dict]:
+    """Cached IV snapshots for symbols in one query; symbols with no snapshot are absent."""
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    placeholders = ",".join("?" * len(symbols))
+    with _db_lock:
+        rows = _get_db().execute(
+            f"SELECT symbol, payload FROM iv WHERE symbol IN ({placeholders})", symbols
+        ).fetchall()
+    snapshots: Dict[str, dict] = {}
+    for symbol, payload in rows:
+        snapshot = _decode_snapshot(payload)
+        if snapshot is not None:
+            snapshots[symbol] = snapshot
+    return snapshots
+
+
+# How long a yf.Ticker and its spot price are reused across requests.
+_TICKER_TTL_SECONDS = 60
+# symbol -> (Ticker, spot, monotonic fetched_at)
+_ticker_cache: Dict[str, Tuple[yf.Ticker, float, float]] = {}
+_ticker_locks: Dict[str, threading.Lock] = {}
+_ticker_locks_guard = threading.Lock()
+
+
+def _spot_price(t: yf.Ticker, ticker_symbol: str) -> float:
+    # fast_info hits the small quote endpoint instead of the full quoteSummary (.info).
+    try:
+        S = float(t.fast_info.last_price)
+    except Exception:
+        S = None
+    if not S or not math.isfinite(S) or S <= 0:
         hist = t.history(period="5d")
         if hist.empty:
             raise IVFetchError(
                 f"No price data found for {ticker_symbol}. Use a valid stock ticker (e.g. AAPL, MSFT)."
             )
         S = float(hist["Close"].iloc[-1])
+    return float(S)
+
+
+def _get_ticker(ticker_symbol: str) -> Tuple[yf.Ticker, float]:
+    """
+    Ticker and spot price, reused for _TICKER_TTL_SECONDS.
+    A per-symbol lock makes concurrent misses share one upstream fetch.
+    """
+    hit = _ticker_cache.get(ticker_symbol)
+    if hit and time.monotonic() - hit[2] < _TICKER_TTL_SECONDS:
+        return hit[0], hit[1]
+    with _ticker_locks_guard:
+        lock = _ticker_locks.setdefault(ticker_symbol, threading.Lock())
+    with lock:
+        hit = _ticker_cache.get(ticker_symbol)
+        if hit and time.monotonic() - hit[2] < _TICKER_TTL_SECONDS:
+            return hit[0], hit[1]
+        t = yf.Ticker(ticker_symbol)
+        S = _spot_price(t, ticker_symbol)
+        _ticker_cache[ticker_symbol] = (t, S, time.monotonic())
+        return t, S
+
+
+@dataclass(frozen=True)
+class IVInputs:
+    """Black-Scholes inputs for solving one ATM call's implied volatility."""
+
+    price: float
+    S: float
+    K: float
+    T: float
+    r: float
+
+
+def _as_float(value: Any) -> float:
+    """Option-row field as float; missing/None/non-numeric become NaN (NaN stays NaN)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _nearest_strike_index(strikes: np.ndarray, S: float) -> int:
+    """Index of the strike closest to S (lower strike on ties); Yahoo sorts chains by strike."""
+    i = int(np.searchsorted(strikes, S))
+    if i >= len(strikes) or (i > 0 and S - strikes[i - 1] <= strikes[i] - S):
+        i -= 1
+    return i
+
+
+def _atm_call(t: yf.Ticker, expiry: str, S: float) -> Optional[dict]:
+    """
+    Nearest-strike call for expiry as a plain dict (strike, bid, ask, lastPrice,
+    impliedVolatility), or None if the chain has no calls.
+
+    Reads yfinance's raw chain payload (a list of dicts) so no calls/puts
+    DataFrames are built; falls back to Ticker.option_chain if that private
+    API is unavailable.
+    """
+    try:
+        calls = t._download_options(t._expirations[expiry]).get("calls") or []
+    except (AttributeError, KeyError, TypeError):
+        frame = t.option_chain(expiry).calls
+        if frame is None or frame.empty:
+            return None
+        # One conversion instead of a Series index lookup per field (NaN is preserved).
+        return frame.iloc[_nearest_strike_index(frame["strike"].to_numpy(), S)].to_dict()
+    if not calls:
+        return None
+    strikes = np.fromiter((_as_float(c.get("strike")) for c in calls), np.float64, len(calls))
+    return calls[_nearest_strike_index(strikes, S)]
+
+
+@lru_cache(maxsize=256)
+def _parse_ymd(s: str) -> int:
+    """Proleptic ordinal of a YYYY-MM-DD expiry string."""
+    return date(int(s[:4]), int(s[5:7]), int(s[8:10])).toordinal()
+
+
+def collect_iv_inputs(ticker_symbol: str, *, now_ord: Optional[int] = None) -> float | IVInputs:
+    """
+    Fetch the nearest-expiry ATM call for a stock/ETF.
+
+    Returns Yahoo's impliedVolatility when usable, otherwise the IVInputs
+    needed to solve for it (see get_stock_iv / compute_ivs_batch).
+    now_ord is today's date ordinal; batch callers pass it once for all symbols.
+    """
+    if ticker_symbol.startswith("^"):
+        raise IVFetchError(
+            f"No options data for {ticker_symbol}. Indices (e.g. ^GSPC) are not supported."
+        )
+
+    t, S = _get_ticker(ticker_symbol)
 
     # Get options chain expirations
     exps = list(getattr(t, "options", []) or [])
@@ -88,25 +266,21 @@ def get_stock_iv(ticker_symbol: str = "AAPL") -> float:
 
     # Nearest expiry
     expiry = exps[0]
-    chain = t.option_chain(expiry)
-    calls = chain.calls
-    if calls is None or calls.empty:
-        raise IVFetchError(f"No call options found for {ticker_symbol}.")
-
     # Pick ATM option
-    atm = calls.loc[(calls["strike"] - S).abs().idxmin()]
+    atm = _atm_call(t, expiry, S)
+    if atm is None:
+        raise IVFetchError(f"No call options found for {ticker_symbol}.")
     K = float(atm["strike"])
 
-    # Prefer Yahoo IV if present
-    if "impliedVolatility" in atm.index and pd.notna(atm["impliedVolatility"]):
-        iv = float(atm["impliedVolatility"])
-        if iv > 0 and math.isfinite(iv):
-            return iv
+    # Prefer Yahoo IV if present; returns before any price parsing.
+    iv = _as_float(atm.get("impliedVolatility"))
+    if iv > 0 and math.isfinite(iv):
+        return iv
 
     # Otherwise compute via mid price (fallback to lastPrice if needed)
-    bid = float(atm["bid"]) if pd.notna(atm.get("bid")) else float("nan")
-    ask = float(atm["ask"]) if pd.notna(atm.get("ask")) else float("nan")
-    last = float(atm["lastPrice"]) if pd.notna(atm.get("lastPrice")) else float("nan")
+    bid = _as_float(atm.get("bid"))
+    ask = _as_float(atm.get("ask"))
+    last = _as_float(atm.get("lastPrice"))
 
     if math.isfinite(bid) and math.isfinite(ask) and bid > 0 and ask > 0:
         price = (bid + ask) / 2.0
@@ -115,49 +289,270 @@ def get_stock_iv(ticker_symbol: str = "AAPL") -> float:
     else:
         raise IVFetchError(f"Option price unavailable for {ticker_symbol} ({expiry} ATM).")
 
-    days = (datetime.strptime(expiry, "%Y-%m-%d") - datetime.now()).days
+    if now_ord is None:
+        now_ord = date.today().toordinal()
+    # Whole days left, as (expiry midnight - now).days: today counts as started.
+    days = _parse_ymd(expiry) - now_ord - 1
     if days <= 1:
         raise IVFetchError(f"Expiry too close for robust IV: {ticker_symbol} {expiry}.")
     T = days / 365.0
 
     # Risk-free rate: demo constant
     r = 0.045
-    return float(implied_volatility(price, S, K, T, r, "c"))
+
+    # Stale/crossed quotes can sit outside the no-arbitrage call range, where no IV exists.
+    intrinsic = max(0.0, S - K * math.exp(-r * T))
+    if price <= intrinsic + 1e-8 or price >= S:
+        raise IVFetchError(
+            f"Option price {price} out of arbitrage bounds for {ticker_symbol} ({expiry} ATM)."
+        )
+    return IVInputs(price=price, S=S, K=K, T=T, r=r)
+
+
+# Volatility bracket for _iv_halley; out-of-bounds prices never converge inside it.
+_IV_LO = 1e-6
+_IV_HI = 10.0
+
+
+@njit(cache=True)
+def _norm_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+@njit(cache=True)
+def _iv_halley(price: float, S: float, K: float, T: float, r: float, is_call: bool) -> float:
+    """
+    Black-Scholes implied volatility via Halley's method, NaN if no root.
+
+    Newton/Halley steps use vega and volga; a [lo, hi] bracket maintained from
+    the sign of the pricing error falls back to bisection whenever a step
+    would leave it, so the iteration cannot diverge.
+    """
+    sqrt_t = math.sqrt(T)
+    df = math.exp(-r * T)
+    lo, hi = _IV_LO, _IV_HI
+    # Brenner-Subrahmanyam (ATM) guess, raised to the Manaster-Koehler inflection
+    # point for away-from-the-money strikes so the iteration starts on the concave side.
+    sigma = max(
+        math.sqrt(2.0 * math.pi / T) * price / S,
+        math.sqrt(2.0 * abs(math.log(S / K) + r * T) / T),
+    )
+    if not (lo < sigma < hi):
+        sigma = 0.5
+    for _ in range(100):
+        vol_t = sigma * sqrt_t
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+        d2 = d1 - vol_t
+        if is_call:
+            value = S * _norm_cdf(d1) - K * df * _norm_cdf(d2)
+        else:
+            value = K * df * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+        diff = value - price
+        if abs(diff) <= 1e-12 * S:
+            return sigma
+        # Price is increasing in sigma, so the sign of the error narrows the bracket.
+        if diff > 0.0:
+            hi = sigma
+        else:
+            lo = sigma
+        vega = S * math.exp(-0.5 * d1 * d1) * sqrt_t / math.sqrt(2.0 * math.pi)
+        new_sigma = -1.0
+        if vega > 1e-300:
+            step = diff / vega
+            volga = vega * d1 * d2 / sigma
+            denom = 1.0 - 0.5 * step * volga / vega
+            new_sigma = sigma - (step / denom if denom > 0.5 else step)
+        if not (lo < new_sigma < hi):
+            new_sigma = 0.5 * (lo + hi)
+        if hi - lo < 1e-14:
+            # Collapsed onto a bracket edge means the price has no root inside it.
+            return new_sigma if lo > _IV_LO and hi < _IV_HI else math.nan
+        sigma = new_sigma
+    return math.nan
+
+
+@njit(cache=True)
+def _iv_halley_calls(
+    price: np.ndarray, S: np.ndarray, K: np.ndarray, T: np.ndarray, r: np.ndarray
+) -> np.ndarray:
+    out = np.empty(price.shape[0])
+    for i in range(price.shape[0]):
+        out[i] = _iv_halley(price[i], S[i], K[i], T[i], r[i], True)
+    return out
+
+
+def compute_ivs_batch(inputs: Sequence[IVInputs]) -> np.ndarray:
+    """
+    Solve many ATM call IVs in one compiled loop over _iv_halley.
+    Entries with no valid solution come back as NaN.
+    """
+    if not inputs:
+        return np.empty(0)
+    return _iv_halley_calls(
+        np.array([x.price for x in inputs], dtype=np.float64),
+        np.array([x.S for x in inputs], dtype=np.float64),
+        np.array([x.K for x in inputs], dtype=np.float64),
+        np.array([x.T for x in inputs], dtype=np.float64),
+        np.array([x.r for x in inputs], dtype=np.float64),
+    )
+
+
+def get_stock_iv(ticker_symbol: str = "AAPL", *, now_ord: Optional[int] = None) -> float:
+    """
+    Get implied volatility for a stock/ETF from its ATM call option.
+    Works for individual stocks/ETFs (AAPL, MSFT, NVDA, SPY, etc.).
+
+    Notes:
+    - Indices like SPX / ^GSPC often won't have an options chain here.
+    - Prefers Yahoo's impliedVolatility field when present.
+    - Falls back to solving Black-Scholes for IV (_iv_halley) if needed.
+    """
+    result = collect_iv_inputs(ticker_symbol, now_ord=now_ord)
+    if not isinstance(result, IVInputs):
+        return result
+    iv = float(_iv_halley(result.price, result.S, result.K, result.T, result.r, True))
+    if not math.isfinite(iv):
+        raise IVFetchError(f"Could not solve IV for {ticker_symbol} from option price.")
+    return iv
+
+
+def warm_up(open_store: bool = True) -> None:
+    """
+    Pay one-off start-up costs before the first request: load (or compile) the
+    Numba solver and its batch loop, and optionally open the snapshot store.
+    """
+    _iv_halley(5.0, 100.0, 100.0, 0.1, 0.045, True)
+    compute_ivs_batch([IVInputs(price=5.0, S=100.0, K=100.0, T=0.1, r=0.045)])
+    if open_store:
+        with _db_lock:
+            _get_db()
+
+
+# Background revalidation for stale-but-usable snapshots (single-flight per symbol).
+_REFRESH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="iv-refresh")
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _revalidate(ticker_symbol: str) -> None:
+    try:
+        store_stock_iv(ticker_symbol, get_stock_iv(ticker_symbol))
+    except Exception:
+        pass  # keep serving the stale snapshot; the next stale read retries
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(ticker_symbol)
+
+
+def _schedule_revalidate(ticker_symbol: str) -> None:
+    with _refreshing_lock:
+        if ticker_symbol in _refreshing:
+            return
+        _refreshing.add(ticker_symbol)
+    _REFRESH_POOL.submit(_revalidate, ticker_symbol)
+
+
+# Adaptive snapshot TTL: shorter for symbols whose IV has been moving.
+_BASE_TTL_SECONDS = 60 * 60 * 24
+_MIN_TTL_SECONDS = 5 * 60
+_TTL_SENSITIVITY = 50.0  # per unit stdev of successive IV changes
+_IV_HISTORY_LEN = 10
+
+
+def _compute_ttl(history: Sequence[Sequence[float]]) -> int:
+    """TTL from recent (fetched_at, iv) snapshots: base / (1 + k * stdev(ΔIV)), clamped."""
+    ivs = [float(iv) for _, iv in history]
+    if len(ivs) < 3:
+        return _BASE_TTL_SECONDS
+    diffs = [b - a for a, b in zip(ivs, ivs[1:])]
+    ttl = _BASE_TTL_SECONDS / (1.0 + _TTL_SENSITIVITY * statistics.stdev(diffs))
+    return int(min(_BASE_TTL_SECONDS, max(_MIN_TTL_SECONDS, ttl)))
+
+
+def fresh_ivs(snapshots: Dict[str, dict]) -> Dict[str, float]:
+    """IVs of the read_iv_snapshots entries still within their adaptive TTL."""
+    now = int(time.time())
+    return {
+        symbol: float(snap["iv"])
+        for symbol, snap in snapshots.items()
+        if isinstance(snap.get("iv"), (int, float))
+        and now - int(snap.get("fetched_at", 0) or 0) <= _compute_ttl(snap.get("recent_ivs", []))
+    }
+
+
+# Default for get_stock_iv_cached(snapshot=...): read the store ourselves.
+_UNREAD: Any = object()
 
 
 def get_stock_iv_cached(
-    ticker_symbol: str, *, max_age_seconds: int = 60 * 60 * 24, refresh: bool = False
+    ticker_symbol: str,
+    *,
+    max_age_seconds: Optional[int] = None,
+    stale_ttl_seconds: int = 30 * 60,
+    refresh: bool = False,
+    revalidate: Optional[bool] = None,
+    snapshot: Any = _UNREAD,
 ) -> float:
     """
-    Cache-first IV fetch.
+    Cache-first IV fetch with stale-while-revalidate.
 
-    - If cache is fresh, returns cached IV.
-    - If refresh=False and cache is missing/stale, raises IVFetchError (no live calls).
+    - If cache is fresh, returns cached IV. Freshness is max_age_seconds when
+      given, else a per-symbol TTL adapted to recent IV movement (_compute_ttl).
+    - If cache is stale by less than stale_ttl_seconds, returns cached IV and,
+      when revalidate (defaults to refresh) is set, refreshes it in the background.
+    - If refresh=False and cache is missing/older than that, raises IVFetchError (no live calls).
     - If refresh=True, attempts a live fetch and writes cache.
+
+    Pass snapshot (a read_iv_snapshots entry, or None if absent) to skip the cache read.
     """
-    path = _cache_path(ticker_symbol)
-    cached = _read_json(path)
+    if revalidate is None:
+        revalidate = refresh
+    if snapshot is _UNREAD:
+        snapshot = read_iv_snapshots([ticker_symbol]).get(ticker_symbol)
     now = int(time.time())
 
-    if cached:
-        fetched_at = int(cached.get("fetched_at", 0) or 0)
-        iv = cached.get("iv")
-        if isinstance(iv, (int, float)) and (now - fetched_at) <= max_age_seconds:
-            return float(iv)
+    if snapshot:
+        fetched_at = int(snapshot.get("fetched_at", 0) or 0)
+        iv = snapshot.get("iv")
+        if isinstance(iv, (int, float)):
+            if max_age_seconds is None:
+                max_age_seconds = _compute_ttl(snapshot.get("recent_ivs", []))
+            age = now - fetched_at
+            if age <= max_age_seconds:
+                return float(iv)
+            if age <= max_age_seconds + stale_ttl_seconds:
+                if revalidate:
+                    _schedule_revalidate(ticker_symbol)
+                return float(iv)
 
     if not refresh:
         raise IVFetchError(
             f"No fresh cached IV for {ticker_symbol}. Run with refresh=true to fetch and cache."
         )
 
-    iv = get_stock_iv(ticker_symbol)
-    _write_json(
-        path,
-        {
-            "symbol": ticker_symbol,
-            "iv": float(iv),
-            "fetched_at": now,
-        },
-    )
-    return float(iv)
+    return store_stock_iv(ticker_symbol, get_stock_iv(ticker_symbol))
 
+
+def store_stock_iv(ticker_symbol: str, iv: float) -> float:
+    """Write a freshly fetched/solved IV to the snapshot cache and return it."""
+    now = int(time.time())
+    with _db_lock:
+        db = _get_db()
+        # History read and write form one transaction, so a concurrent store of the
+        # same symbol (a background revalidate, or another process) can't drop an entry.
+        db.execute("BEGIN IMMEDIATE")
+        with db:
+            row = db.execute(
+                "SELECT payload FROM iv WHERE symbol = ?", (ticker_symbol,)
+            ).fetchone()
+            previous = (_decode_snapshot(row[0]) if row else None) or {}
+            history = [*previous.get("recent_ivs", []), [now, float(iv)]][-_IV_HISTORY_LEN:]
+            data = {
+                "symbol": ticker_symbol,
+                "iv": float(iv),
+                "fetched_at": now,
+                "recent_ivs": history,
+            }
+            # Encoded in the transaction: the payload embeds the history just read.
+            _upsert_snapshot(db, data, _encode_snapshot(data))
+    return float(iv)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
 from pathlib import Path
 
-from fastapi import FastAPI, Header, HTTPException
+import numpy as np
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -19,12 +28,70 @@ from .demo_data import (
     get_demo_regime,
     get_universe,
 )
-from .iv_fetcher import IVFetchError, get_stock_iv_cached
+from .iv_fetcher import (
+    IVFetchError,
+    IVInputs,
+    collect_iv_inputs,
+    compute_ivs_batch,
+    fresh_ivs,
+    get_stock_iv_cached,
+    read_iv_snapshots,
+    store_stock_iv,
+    warm_up,
+)
 
 
 app = FastAPI(title=settings.app_name, version=settings.version)
 
 
+# Batch IV solves run in worker processes so numerics never hold up the event loop.
+# Created at startup (spawned, not forked: the API process already has threads and
+# an open SQLite connection) and replaced if a worker dies.
+_solve_pool: ProcessPoolExecutor | None = None
+
+
+def _get_solve_pool() -> ProcessPoolExecutor:
+    global _solve_pool
+    if _solve_pool is None:
+        _solve_pool = ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up,
+            initargs=(False,),
+        )
+    return _solve_pool
+
+
+def _discard_solve_pool(pool: ProcessPoolExecutor) -> None:
+    global _solve_pool
+    if _solve_pool is pool:
+        _solve_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _solve_ivs(inputs: list[IVInputs]) -> np.ndarray:
+    """compute_ivs_batch on the solve pool; solved in a thread if the pool is broken."""
+    pool = _get_solve_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, compute_ivs_batch, inputs)
+    except BrokenProcessPool:
+        _discard_solve_pool(pool)  # the next request starts fresh workers
+        return await asyncio.to_thread(compute_ivs_batch, inputs)
+
+
+@app.on_event("startup")
+def _warm_iv_solvers() -> None:
+    # Solver JIT/imports otherwise land on the first /api/options-iv request.
+    warm_up()
+    _get_solve_pool().submit(compute_ivs_batch, [])  # start a (warmed) solve worker
+
+
+@app.on_event("shutdown")
+def _stop_solve_pool() -> None:
+    if _solve_pool is not None:
+        _discard_solve_pool(_solve_pool)
+
+
 def get_current_advisor(authorization: str | None = Header(None, alias="Authorization")) -> dict | None:
     if not authorization or not authorization.startswith("Bearer "):
         return None
@@ -53,25 +120,117 @@ class CreateClientRequest(BaseModel):
     target_annual_vol: float
 
 
+# Upper bound on concurrent per-symbol Yahoo fetches for /api/options-iv.
+IV_FETCH_CONCURRENCY = 8
+# Dedicated workers so fetches don't queue behind the loop's small default executor.
+_IV_FETCH_POOL = ThreadPoolExecutor(max_workers=IV_FETCH_CONCURRENCY, thread_name_prefix="iv-fetch")
+# Browsers may keep /api/options-iv but must revalidate it (ETag) on every use, so a
+# payload cached while the store was cold never outlives the refresh that fills it.
+IV_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+async def _fetch_missing_ivs(
+    symbols: list[str], snapshots: dict[str, dict], refresh: bool, ivs: dict, errors: dict
+) -> None:
+    """
+    Resolve symbols with no fresh snapshot into ivs/errors: stale-but-usable
+    entries are served, and with refresh the rest are fetched concurrently on
+    _IV_FETCH_POOL, with IV solves batched into one call on the solve pool.
+    """
+    loop = asyncio.get_running_loop()
+    today_ord = date.today().toordinal()
+
+    def _fetch(symbol: str) -> float | IVInputs:
+        try:
+            # Stale-but-usable entries are served and revalidated in the background.
+            return get_stock_iv_cached(
+                symbol, refresh=False, revalidate=refresh, snapshot=snapshots.get(symbol)
+            )
+        except IVFetchError:
+            if not refresh:
+                raise
+        result = collect_iv_inputs(symbol, now_ord=today_ord)
+        if isinstance(result, IVInputs):
+            return result  # solved below in one batch with the other symbols
+        return store_stock_iv(symbol, result)
+
+    async def _one(symbol: str) -> tuple[str, float | IVInputs | None, str | None]:
+        try:
+            return symbol, await loop.run_in_executor(_IV_FETCH_POOL, _fetch, symbol), None
+        except IVFetchError as e:
+            return symbol, None, str(e)
+        except Exception as e:
+            return symbol, None, f"Unexpected error: {e}"
+
+    pending: dict[str, IVInputs] = {}
+    for symbol, result, error in await asyncio.gather(*(_one(s) for s in symbols)):
+        if error is not None:
+            errors[symbol] = error
+        elif isinstance(result, IVInputs):
+            pending[symbol] = result
+        else:
+            ivs[symbol] = result
+
+    if not pending:
+        return
+    try:
+        solved = await _solve_ivs(list(pending.values()))
+    except Exception as e:
+        for symbol in pending:
+            errors[symbol] = f"IV solve failed: {e}"
+        return
+
+    def _store_solved() -> None:
+        for symbol, iv in zip(pending, solved.tolist()):
+            if not (math.isfinite(iv) and iv > 0):
+                errors[symbol] = f"Could not solve IV for {symbol} from option price."
+                continue
+            try:
+                ivs[symbol] = store_stock_iv(symbol, iv)
+            except Exception as e:
+                errors[symbol] = f"Unexpected error: {e}"
+
+    # SQLite writes contend on the store lock with fetch/refresh threads: keep them off the loop.
+    await loop.run_in_executor(_IV_FETCH_POOL, _store_solved)
+
+
 @app.get("/api/options-iv")
-def options_iv(
-    refresh: bool = False, authorization: str | None = Header(None, alias="Authorization")
-) -> dict:
+async def options_iv(
+    refresh: bool = False,
+    authorization: str | None = Header(None, alias="Authorization"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+) -> Response:
     """
     Returns cache-first ATM IV per ticker in the universe.
     Set refresh=true to force live fetch and update cache.
+    When every snapshot is fresh this is one store read; otherwise see
+    _fetch_missing_ivs. The response carries an ETag; a matching If-None-Match gets 304.
     """
     require_advisor(authorization)
-    ivs: dict = {}
+    universe = get_universe()
+    snapshots = await asyncio.to_thread(read_iv_snapshots, universe)
+    # Fresh snapshots are served as-is; only the rest go through the fetch path.
+    ivs: dict = fresh_ivs(snapshots)
+    missing = [s for s in universe if s not in ivs]
     errors: dict = {}
-    for symbol in get_universe():
-        try:
-            ivs[symbol] = get_stock_iv_cached(symbol, refresh=refresh)
-        except IVFetchError as e:
-            errors[symbol] = str(e)
-        except Exception as e:
-            errors[symbol] = f"Unexpected error: {e}"
-    return {"iv": ivs, "errors": errors, "refresh": refresh}
+    if missing:
+        await _fetch_missing_ivs(missing, snapshots, refresh, ivs, errors)
+    ivs = {s: ivs[s] for s in universe if s in ivs}
+
+    response = JSONResponse({"iv": ivs, "errors": errors, "refresh": refresh})
+    etag = f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": IV_CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
 
 
 app.add_middleware(
@@ -179,22 +338,22 @@ def portfolios() -> dict:
                     "risk_label": c.client.risk_label,
                     "target_annual_vol": c.client.target_annual_vol,
                 },
-                "current_weights": c.current_weights,
+                "current_weights": c.current_weights_as_dict,
                 "baseline_optimal": {
                     "as_of": c.baseline_optimal.as_of,
-                    "weights": c.baseline_optimal.weights,
+                    "weights": c.baseline_optimal.as_dict,
                     "expected_return": c.baseline_optimal.expected_return,
                     "expected_vol": c.baseline_optimal.expected_vol,
                     "sharpe": c.baseline_optimal.sharpe,
                 },
                 "iv_adjusted_optimal": {
                     "as_of": c.iv_adjusted_optimal.as_of,
-                    "weights": c.iv_adjusted_optimal.weights,
+                    "weights": c.iv_adjusted_optimal.as_dict,
                     "expected_return": c.iv_adjusted_optimal.expected_return,
                     "expected_vol": c.iv_adjusted_optimal.expected_vol,
                     "sharpe": c.iv_adjusted_optimal.sharpe,
                 },
-                "drift_from_optimal": c.drift_from_optimal,
+                "drift_from_optimal": c.drift_as_dict,
                 "current_annual_vol": c.current_annual_vol,
                 "misaligned_with_profile": c.misaligned_with_profile,
             }
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import data_pipeline
+
+
+def _fake_download(calls, missing=()):
+    def download(tickers, start=None, end=None, **kwargs):
+        calls.append(list(tickers))
+        dates = pd.bdate_range("2021-01-04", periods=600)
+        rng = np.random.default_rng(0)
+        columns = pd.MultiIndex.from_product([tickers, ["Open", "Close"]])
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), len(columns))), axis=0))
+        frame = pd.DataFrame(prices, index=dates, columns=columns)
+        for ticker in missing:
+            frame[ticker] = np.nan
+        return frame
+
+    return download
+
+
+def test_second_get_clean_data_is_served_from_cache(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_pipeline, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(data_pipeline.yf, "download", _fake_download(calls))
+
+    prices, returns = data_pipeline.get_clean_data(["MSFT", "AAPL"])
+    cached_prices, cached_returns = data_pipeline.get_clean_data(["AAPL", "MSFT"])
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cached_prices, prices, check_freq=False)
+    pd.testing.assert_frame_equal(cached_returns, returns, check_freq=False)
+
+
+def test_market_bundle_is_one_download(monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_pipeline.yf, "download", _fake_download(calls))
+
+    prices, benchmark, risk_free = data_pipeline.fetch_market_bundle(["AAPL", "MSFT"])
+
+    assert calls == [["AAPL", "MSFT", data_pipeline.BENCHMARK_SYMBOL, data_pipeline.RISK_FREE_SYMBOL]]
+    assert list(prices.columns) == ["AAPL", "MSFT"]
+    assert len(benchmark) == len(prices)
+    frame = _fake_download([])(calls[0])
+    assert risk_free == frame[(data_pipeline.RISK_FREE_SYMBOL, "Close")].iloc[-1] / 100
+
+
+def test_market_bundle_rejects_missing_yield(monkeypatch):
+    monkeypatch.setattr(
+        data_pipeline.yf, "download", _fake_download([], missing=[data_pipeline.RISK_FREE_SYMBOL])
+    )
+
+    with pytest.raises(ValueError):
+        data_pipeline.fetch_market_bundle("AAPL")
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+from app import iv_fetcher
+from app.iv_fetcher import IVFetchError, IVInputs, compute_ivs_batch, get_stock_iv
+
+
+def _norm_cdf(x):
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+def _bs_call(S, K, T, r, sigma):
+    vol_t = sigma * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / vol_t
+    d2 = d1 - vol_t
+    return S * _norm_cdf(d1) - K * math.exp(-r * T) * _norm_cdf(d2)
+
+
+def _random_calls(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    cases = []
+    while len(cases) < n:
+        S = 100.0
+        K = rng.uniform(60.0, 140.0)
+        T = rng.uniform(0.02, 2.0)
+        r = rng.uniform(0.0, 0.08)
+        price = _bs_call(S, K, T, r, rng.uniform(0.05, 1.5))
+        # Skip prices indistinguishable from the bounds, where the IV is ill-conditioned.
+        if max(0.0, S - K * math.exp(-r * T)) + 1e-6 < price < S - 1e-6:
+            cases.append(IVInputs(price=price, S=S, K=K, T=T, r=r))
+    return cases
+
+
+def test_halley_round_trips_black_scholes_prices():
+    for x in _random_calls():
+        iv = iv_fetcher._iv_halley(x.price, x.S, x.K, x.T, x.r, True)
+        assert abs(_bs_call(x.S, x.K, x.T, x.r, iv) - x.price) <= 1e-9 * x.S
+
+
+def test_batch_matches_scalar_solver():
+    cases = _random_calls(500, seed=1)
+    batch = compute_ivs_batch(cases)
+    scalar = [iv_fetcher._iv_halley(x.price, x.S, x.K, x.T, x.r, True) for x in cases]
+    np.testing.assert_allclose(batch, scalar, rtol=0, atol=1e-12)
+    assert compute_ivs_batch([]).shape == (0,)
+
+
+@pytest.mark.parametrize("price", [0.5 * (100.0 - 90.0 * math.exp(-0.045 * 0.5)), 100.0, 150.0])
+def test_out_of_bounds_prices_have_no_root(price):
+    x = IVInputs(price=price, S=100.0, K=90.0, T=0.5, r=0.045)
+    assert math.isnan(iv_fetcher._iv_halley(x.price, x.S, x.K, x.T, x.r, True))
+    assert math.isnan(compute_ivs_batch([x])[0])
+
+
+def test_get_stock_iv_raises_when_no_root(monkeypatch):
+    no_root = IVInputs(price=150.0, S=100.0, K=100.0, T=0.5, r=0.045)
+    monkeypatch.setattr(iv_fetcher, "collect_iv_inputs", lambda symbol, now_ord=None: no_root)
+
+    with pytest.raises(IVFetchError):
+        get_stock_iv("AAPL")